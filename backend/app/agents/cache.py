@@ -0,0 +1,59 @@
+"""
+Inner Agent Response Cache
+
+Small in-process LRU cache with time-based expiry, used to short-circuit
+repeated LLM calls for identical inner agent inputs.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+def make_cache_key(*parts: Any) -> bytes:
+    """Build a compact cache key from the given parts
+    
+    Args:
+        parts: Values identifying an LLM call
+        
+    Returns:
+        blake2b digest of the joined parts
+    """
+    return hashlib.blake2b("\0".join(str(part) for part in parts).encode()).digest()
+
+
+class ResponseCache:
+    """LRU cache whose entries expire after a fixed time-to-live"""
+    
+    def __init__(self, ttl: float, max_size: int = 256):
+        """Initialize an empty cache
+        
+        Args:
+            ttl: Seconds an entry stays valid
+            max_size: Maximum number of entries before the least recently used is evicted
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        
+        self._entries.move_to_end(key)
+        return value
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value under key, evicting the least recently used entry if full"""
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
@@ -6,19 +6,65 @@ using tools, and generating responses back to the user.
 """
 
 import asyncio
-from typing import AsyncGenerator, Dict, List, Tuple, Any, Optional
+from typing import AsyncGenerator, Dict, List, Tuple, Any, Optional, Union
 from datetime import datetime
+from functools import lru_cache
+import itertools
+import secrets
+import os
 import uuid
 import json
 
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib serializer
+    orjson = None
+
 from langchain_core.language_models import BaseChatModel
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import PydanticOutputParser
+from langchain_core.messages import SystemMessage
+from langchain_core.prompts import HumanMessagePromptTemplate, PromptTemplate
+from langchain_core.runnables import Runnable
 from pydantic import BaseModel, Field
 
 from ..models import FlowStep, StreamChunk
+from .cache import ResponseCache, make_cache_key
 from .commands import COMPLETE, NEEDS_TOOL, NEEDS_RESEARCH, NEEDS_REVIEW, ERROR, AWAITING_TOOL_CONFIRMATION
-from .prompts import INNER_AGENT_PROMPT
+from .prompts import INNER_AGENT_SYSTEM_PROMPT, INNER_AGENT_INPUT_PROMPT
+
+
+# The debug summary stored in each step's thinking field is only built when enabled
+_DEBUG = os.getenv("SUPEREGO_DEBUG") == "1"
+
+# Tool execution IDs only need to be unique within this process
+_tool_execution_counter = itertools.count()
+
+# next_agent values the LLM may use to loop back to itself or to end the flow
+_SELF_SENTINELS = frozenset({"self"})
+_END_SENTINELS = frozenset({"complete", "end", "", None})
+
+# Used when a flow instance has no tool confirmation settings stored
+_DEFAULT_CONFIRMATION_SETTINGS = {"confirm_all": True, "exempted_tools": frozenset()}
+
+# Upper bound on concurrent inner agent LLM requests, to stay clear of provider rate limits
+_LLM_SEMAPHORE = asyncio.Semaphore(int(os.getenv("INNER_LLM_CONCURRENCY", "8")))
+
+# Pending LLM results keyed on the inputs that shape the prompt, so identical
+# concurrent calls share one request
+_inflight: Dict[bytes, asyncio.Future] = {}
+
+# Longest tool result copied into agent guidance; bounds prompt size on self-loops
+MAX_GUIDANCE_CHARS = 4000
+
+# Upper bound on tools running at once when a turn requests several
+MAX_TOOL_CONCURRENCY = 4
+_TOOL_SEMAPHORE = asyncio.Semaphore(MAX_TOOL_CONCURRENCY)
+
+
+def _dumps(value: Any, indent: bool = False) -> str:
+    """Serialize value to a JSON string, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2 if indent else None).decode()
+    return json.dumps(value, indent=2 if indent else None)
 
 
 class ToolUsage(BaseModel):
@@ -32,82 +78,204 @@ class ToolUsage(BaseModel):
 class InnerAgentOutput(BaseModel):
     """Structured output from inner agent processing"""
     thinking: str = Field(description="Detailed reasoning process (not shown to user)")
-    tool_usage: Optional[ToolUsage] = Field(description="Record of tool used, if any", default=None)
+    tool_usage: Optional[Union[ToolUsage, List[ToolUsage]]] = Field(
+        description="Record of tool used, if any, or a list of records for several independent tools",
+        default=None
+    )
     agent_guidance: str = Field(description="Hidden context for the next agent")
     response: str = Field(description="Helpful response to the user")
     next_agent: Optional[str] = Field(description="Next agent to call, or null to end flow", default=None)
 
 
+# Prompt templates built once at import; they depend only on constants
+_SYSTEM_PROMPT = PromptTemplate.from_template(INNER_AGENT_SYSTEM_PROMPT)
+_INPUT_PROMPT = HumanMessagePromptTemplate.from_template(INNER_AGENT_INPUT_PROMPT)
+
+
+@lru_cache(maxsize=128)
+def _system_message(agent_id: str, system_prompt: str, tools_str: str) -> SystemMessage:
+    """Build the static system message for an agent, marked cacheable for providers
+    
+    The result only depends on the agent's configuration, so it is memoized; a
+    self-loop turn then only has to format the per-turn input message.
+    Anthropic (directly or via OpenRouter) reads the cache_control marker on a
+    content block; providers with implicit prefix caching ignore it.
+    """
+    return SystemMessage(content=[{
+        "type": "text",
+        "text": _SYSTEM_PROMPT.format(
+            agent_id=agent_id,
+            system_prompt=system_prompt,
+            available_tools=tools_str
+        ),
+        "cache_control": {"type": "ephemeral"}
+    }])
+
+
+def format_tools(available_tools: Dict[str, callable]) -> str:
+    """Format the available tools for the prompt
+    
+    Names are sorted so the prompt is stable across calls, which keeps
+    provider prompt caches hitting.
+    
+    Args:
+        available_tools: Dict of tool name -> function
+        
+    Returns:
+        Bulleted list of tool names, or a placeholder if there are none
+    """
+    return "\n".join(f"- {name}" for name in sorted(available_tools)) or "No tools available."
+
+
+def bind_structured_output(llm: BaseChatModel) -> Runnable:
+    """Bind the InnerAgentOutput schema to a language model
+    
+    Args:
+        llm: Language model to bind
+        
+    Returns:
+        Runnable that produces InnerAgentOutput via function calling
+    """
+    return llm.with_structured_output(InnerAgentOutput, method="function_calling")
+
+
 async def process_with_tools(
-    llm: BaseChatModel,
+    structured_llm: Runnable,
     input_message: str,
     system_prompt: str,
     agent_guidance: str,
     agent_id: str,
-    available_tools: Dict[str, callable] = None
-) -> Tuple[str, Optional[Dict[str, Any]], str, Optional[str]]:
-    """Process an input message using available tools
+    tools_str: str = "No tools available."
+) -> AsyncGenerator[Any, None]:
+    """Process an input message using available tools, streaming the response
+    
+    Identical calls that are already in flight share a single LLM request;
+    callers that join an in-flight request receive only the final result.
+    If the owning stream is abandoned, joiners retry with their own request.
     
     Args:
-        llm: Language model for processing
+        structured_llm: Language model bound to InnerAgentOutput (see bind_structured_output)
         input_message: The user's input
         system_prompt: The system prompt for this agent
         agent_guidance: Guidance from the superego agent
         agent_id: Identifier for this agent
-        available_tools: Dict of tool name -> function
+        tools_str: Prompt listing of available tools (see format_tools)
         
-    Returns:
-        Tuple of (response, tool_usage, agent_guidance, next_agent)
+    Yields:
+        StreamChunk with the response text so far each time it grows, then a final
+        tuple of (response, tool_usage, agent_guidance, next_agent)
     """
     import logging
     logger = logging.getLogger("uvicorn")
     
-    # Create output parser
-    parser = PydanticOutputParser(pydantic_object=InnerAgentOutput)
+    key = make_cache_key(agent_id, system_prompt, input_message, agent_guidance, tools_str)
+    while (pending := _inflight.get(key)) is not None:
+        logger.info("Joining identical in-flight inner agent call")
+        try:
+            response, tool_usage, new_guidance, next_agent = await asyncio.shield(pending)
+        except asyncio.CancelledError:
+            if not pending.cancelled():
+                # This caller was cancelled, not the call it joined
+                raise
+            # The owning stream was abandoned (e.g. client disconnect); join or make a fresh call
+            logger.info("In-flight inner agent call was abandoned, retrying")
+            continue
+        yield response, _copy_tool_usage(tool_usage), new_guidance, next_agent
+        return
     
-    # Format available tools string
-    tools_str = "No tools available."
-    if available_tools:
-        tools_str = "\n".join([f"- {name}" for name in available_tools.keys()])
-    
-    # Get format instructions
-    format_instructions = parser.get_format_instructions()
+    future = asyncio.get_running_loop().create_future()
+    # Mark failures as retrieved so a call nobody joined doesn't log a warning
+    future.add_done_callback(lambda f: f.cancelled() or f.exception())
+    _inflight[key] = future
+    try:
+        async for item in _stream_inner_agent_output(
+            structured_llm, input_message, system_prompt, agent_guidance, agent_id, tools_str
+        ):
+            if not isinstance(item, StreamChunk):
+                response, tool_usage, new_guidance, next_agent = item
+                future.set_result((response, _copy_tool_usage(tool_usage), new_guidance, next_agent))
+            yield item
+    except Exception as e:
+        if not future.done():
+            future.set_exception(e)
+        raise
+    finally:
+        # Joiners treat a cancelled future as abandoned and retry rather than failing
+        if not future.done():
+            future.cancel()
+        if _inflight.get(key) is future:
+            del _inflight[key]
+
+
+async def _stream_inner_agent_output(
+    structured_llm: Runnable,
+    input_message: str,
+    system_prompt: str,
+    agent_guidance: str,
+    agent_id: str,
+    tools_str: str
+) -> AsyncGenerator[Any, None]:
+    """Call the LLM for process_with_tools, yielding chunks and then the result tuple"""
+    import logging
+    logger = logging.getLogger("uvicorn")
     
-    # Create prompt template with format instructions as a parameter
-    template = INNER_AGENT_PROMPT + "\n\nOutput Format Instructions:\n{format_instructions}"
-    prompt = ChatPromptTemplate.from_template(template)
-    
-    # Format prompt with all parameters
-    messages = prompt.format_messages(
-        system_prompt=system_prompt,
-        input_message=input_message,
-        agent_guidance=agent_guidance,
-        agent_id=agent_id,
-        available_tools=tools_str,
-        format_instructions=format_instructions
-    )
+    # Static system block first so provider prompt caches can match its prefix
+    messages = [
+        _system_message(agent_id, system_prompt, tools_str),
+        _INPUT_PROMPT.format(input_message=input_message, agent_guidance=agent_guidance)
+    ]
     
     logger.info(f"Inner agent prompt formatted successfully")
     
-    # Call LLM
-    response = await llm.ainvoke(messages)
-    result = parser.parse(response.content)
+    # Stream partial structured outputs, forwarding the response text so far whenever it grows
+    # (clients replace their displayed text with each partial_output)
+    result = None
+    streamed = ""
+    async with _LLM_SEMAPHORE:
+        async for partial in structured_llm.astream(messages):
+            if partial is None:
+                continue
+            result = partial
+            if result.response != streamed:
+                # Fields are already validated str/bool values, so skip revalidation
+                yield StreamChunk.model_construct(
+                    partial_output=result.response, complete=False, flow_step=None
+                )
+                streamed = result.response
+    
+    if result is None:
+        raise ValueError("Language model returned no structured output")
     
     # Convert tool usage to dict if present
     tool_usage_dict = None
-    if result.tool_usage:
-        tool_usage_dict = result.tool_usage.dict()
+    if isinstance(result.tool_usage, list):
+        tool_usage_dict = [usage.model_dump() for usage in result.tool_usage] or None
+    elif result.tool_usage:
+        tool_usage_dict = result.tool_usage.model_dump()
     
     # Validate next_agent decision and map to valid transition keys
-    if result.next_agent == "self":
-        result.next_agent = agent_id
-    elif result.next_agent == "complete" or result.next_agent == "end" or result.next_agent is None:
+    next_agent = result.next_agent
+    if next_agent in _SELF_SENTINELS:
+        next_agent = agent_id
+    elif next_agent in _END_SENTINELS:
         # Map None to COMPLETE for proper transitions
-        result.next_agent = "COMPLETE"
-    elif result.next_agent == agent_id:
-        result.next_agent = "NEEDS_TOOL"
+        next_agent = COMPLETE
+    elif next_agent == agent_id:
+        next_agent = NEEDS_TOOL
     
-    return result.response, tool_usage_dict, result.agent_guidance, result.next_agent
+    yield result.response, tool_usage_dict, result.agent_guidance, next_agent
+
+
+def _format_tool_result(result: Any) -> str:
+    """Render a tool result for agent guidance, truncated to MAX_GUIDANCE_CHARS"""
+    if not isinstance(result, str):
+        try:
+            result = _dumps(result)
+        except TypeError:
+            result = str(result)
+    if len(result) > MAX_GUIDANCE_CHARS:
+        result = result[:MAX_GUIDANCE_CHARS] + "... [truncated]"
+    return result
 
 
 async def execute_tool(
@@ -131,23 +299,47 @@ async def execute_tool(
     tool_func = available_tools[tool_name]
     
     try:
-        # Execute the tool (handle both sync and async tools)
+        # Execute the tool (sync tools run in a worker thread so they don't block the event loop)
         if asyncio.iscoroutinefunction(tool_func):
             result = await tool_func(tool_input)
         else:
-            result = tool_func(tool_input)
+            result = await asyncio.to_thread(tool_func, tool_input)
         return result
     except Exception as e:
         return f"Error executing tool: {str(e)}"
 
 
+async def execute_tools(
+    tool_calls: List[Dict[str, Any]],
+    available_tools: Dict[str, callable]
+) -> List[Any]:
+    """Execute independent tool calls concurrently
+    
+    Args:
+        tool_calls: Tool usage records with tool_name and input
+        available_tools: Dict of available tools
+        
+    Returns:
+        Tool execution results, in the same order as tool_calls
+    """
+    if len(tool_calls) == 1:
+        call = tool_calls[0]
+        return [await execute_tool(call["tool_name"], call["input"], available_tools)]
+    
+    async def run(call: Dict[str, Any]) -> Any:
+        async with _TOOL_SEMAPHORE:
+            return await execute_tool(call["tool_name"], call["input"], available_tools)
+    
+    return list(await asyncio.gather(*(run(call) for call in tool_calls)))
+
+
 async def create_inner_agent_step(
     prev_step: Dict[str, Any],
     agent_id: str,
     response: str,
-    tool_usage: Optional[Dict[str, Any]],
+    tool_usage: Optional[Union[Dict[str, Any], List[Dict[str, Any]]]],
     agent_guidance: str,
-    thinking: str,
+    thinking: Optional[str],
     system_prompt: str,
     next_agent: Optional[str]
 ) -> FlowStep:
@@ -159,7 +351,7 @@ async def create_inner_agent_step(
         response: The agent's response
         tool_usage: Record of any tool usage
         agent_guidance: Guidance for the next agent
-        thinking: Reasoning process
+        thinking: Reasoning process (None when SUPEREGO_DEBUG is off)
         system_prompt: System prompt for this agent
         next_agent: Next agent to call
         
@@ -168,7 +360,7 @@ async def create_inner_agent_step(
     """
     # Create step
     return FlowStep(
-        step_id=str(uuid.uuid4()),
+        step_id=uuid.uuid4().hex,
         agent_id=agent_id,
         timestamp=datetime.now().isoformat(),
         role="assistant",
@@ -182,12 +374,20 @@ async def create_inner_agent_step(
     )
 
 
+def _copy_tool_usage(tool_usage: Any) -> Any:
+    """Shallow-copy a tool usage record (or list of records)"""
+    if isinstance(tool_usage, list):
+        return [dict(usage) for usage in tool_usage]
+    return dict(tool_usage) if tool_usage else None
+
+
 async def create_inner_agent_node(
     llm: BaseChatModel,
     agent_id: str = "inner_agent",
     max_iterations: int = 3,
     system_prompt: str = "",
-    available_tools: Dict[str, callable] = None
+    available_tools: Dict[str, callable] = None,
+    cache_ttl: Optional[float] = None
 ) -> callable:
     """Create a langgraph-compatible inner agent node function
     
@@ -197,12 +397,28 @@ async def create_inner_agent_node(
         max_iterations: Maximum number of iterations
         system_prompt: System prompt for this agent
         available_tools: Dict of available tools
+        cache_ttl: Seconds to cache LLM results for identical inputs (disabled if None)
         
     Returns:
         Async generator function that streams results
     """
     if available_tools is None:
         available_tools = {}
+    
+    # Bind the output schema once for the lifetime of this node
+    structured_llm = bind_structured_output(llm)
+    
+    # Optional cache of LLM results keyed on everything that shapes the prompt
+    response_cache = ResponseCache(cache_ttl) if cache_ttl else None
+    
+    # The tool listing is fixed for this node, so format it once
+    tools_str = format_tools(available_tools)
+    
+    # Constant chunk reused on every turn rather than rebuilt per call
+    processing_chunk = StreamChunk(
+        partial_output="Processing your request...",
+        complete=False
+    )
         
     async def inner_agent_node(state):
         """Inner agent node function that processes inputs and streams results"""
@@ -223,112 +439,154 @@ async def create_inner_agent_node(
         logger.info(f"Inner agent processing input: '{input_message[:50]}...'")
         
         # Emit an initial response to show we're processing
-        initial_chunk = StreamChunk(
-            partial_output="Processing your request...",
-            complete=False
-        )
-        yield initial_chunk
+        yield processing_chunk
         
-        # Process the input
-        response, tool_usage, new_guidance, next_agent = await process_with_tools(
-            llm, input_message, system_prompt, agent_guidance, 
-            agent_id, available_tools
-        )
+        cache_key = None
+        cached = None
+        if response_cache is not None:
+            cache_key = make_cache_key(system_prompt, input_message, agent_guidance, tools_str)
+            cached = response_cache.get(cache_key)
         
-        # Emit the actual response text right away as a stream chunk
-        response_chunk = StreamChunk(
+        if cached is not None:
+            logger.info("Inner agent response served from cache")
+            response, tool_usage, new_guidance, next_agent = cached
+            # Copy so tool execution below doesn't mutate the cached record
+            tool_usage = _copy_tool_usage(tool_usage)
+        else:
+            # Process the input, forwarding LLM tokens as they stream in
+            async for item in process_with_tools(
+                structured_llm, input_message, system_prompt, agent_guidance, 
+                agent_id, tools_str
+            ):
+                if isinstance(item, StreamChunk):
+                    yield item
+                else:
+                    response, tool_usage, new_guidance, next_agent = item
+            
+            if cache_key is not None:
+                response_cache.set(cache_key, (
+                    response, _copy_tool_usage(tool_usage), new_guidance, next_agent
+                ))
+        
+        # Chunk carrying the actual response text; emitted below once any tools are started
+        # (response is a validated str, so skip revalidation)
+        response_chunk = StreamChunk.model_construct(
             partial_output=response,
-            complete=False
+            complete=False,
+            flow_step=None
         )
-        yield response_chunk
         
-        # If tool usage is indicated
-        if tool_usage and "tool_name" in tool_usage and tool_usage["tool_name"] in available_tools:
-            tool_name = tool_usage["tool_name"]
-            tool_input = tool_usage["input"]
+        # If tool usage is indicated (a single call or a list of independent calls)
+        tool_calls = tool_usage if isinstance(tool_usage, list) else [tool_usage] if tool_usage else []
+        tool_calls = [
+            call for call in tool_calls
+            if "tool_name" in call and call["tool_name"] in available_tools
+        ]
+        if tool_calls:
+            # Collect guidance additions and join once, rather than growing a string per tool
+            guidance_parts = [new_guidance]
             
-            logger.info(f"Tool usage detected: {tool_name}")
+            logger.info(f"Tool usage detected: {[call['tool_name'] for call in tool_calls]}")
             
             # Check if the flow instance has confirmation settings
             # Access instance_id properly from the FlowState object
             instance_id = state.instance_id
             
-            # Default to requiring confirmation
-            requires_confirmation = True
-            
             # Check if we can access the flow engine and confirmation settings
+            # (imported here because flow.engine imports this module via the builder)
             from ..flow.engine import flow_engine
-            if instance_id and hasattr(flow_engine, 'active_flows') and instance_id in flow_engine.active_flows:
-                flow_instance = flow_engine.active_flows[instance_id]
-                
+            flow_instance = flow_engine.active_flows.get(instance_id) if instance_id else None
+            if flow_instance is not None:
                 # Get confirmation settings
-                confirm_all = flow_instance.get("tool_confirmation_settings", {}).get("confirm_all", True)
-                exempted_tools = flow_instance.get("tool_confirmation_settings", {}).get("exempted_tools", [])
+                settings = flow_instance.get("tool_confirmation_settings") or _DEFAULT_CONFIRMATION_SETTINGS
+                confirm_all = settings.get("confirm_all", True)
+                exempted_tools = settings.get("exempted_tools", frozenset())
+            else:
+                # Cannot access confirmation settings, default to execute
+                logger.info("Could not access confirmation settings, executing tools")
+            
+            calls_to_execute = []
+            confirmation_requests = []
+            for call in tool_calls:
+                tool_name = call["tool_name"]
+                tool_input = call["input"]
+                
+                if flow_instance is None:
+                    calls_to_execute.append(call)
+                    continue
                 
                 # Check if this tool is exempt from confirmation
                 requires_confirmation = confirm_all and tool_name not in exempted_tools
                 
                 # Add this information to tool_usage
-                tool_usage["requires_confirmation"] = requires_confirmation
+                call["requires_confirmation"] = requires_confirmation
                 
-                # If confirmation is required, save pending tool execution
-                if requires_confirmation:
-                    # Generate a unique ID for this tool execution
-                    tool_execution_id = str(uuid.uuid4())
-                    
-                    logger.info(f"Tool requires confirmation, ID: {tool_execution_id}")
-                    
-                    # Store pending tool execution
-                    flow_instance["pending_tool_executions"][tool_execution_id] = {
-                        "tool_name": tool_name,
-                        "tool_input": tool_input,
-                        "state": state,
-                        "timestamp": datetime.now().isoformat()
-                    }
-                    
-                    # Update response and next_agent to indicate waiting for confirmation
-                    response = f"I'd like to use the tool '{tool_name}' with the following input:\n\n{json.dumps(tool_input, indent=2)}\n\nPlease confirm if I can proceed."
-                    next_agent = AWAITING_TOOL_CONFIRMATION
-                    
-                    # Set tool_usage output to indicate awaiting confirmation
-                    tool_usage["output"] = "Awaiting user confirmation"
-                    
-                    # Create thinking and update agent guidance
-                    new_guidance += f"\nTool {tool_name} requires confirmation. Execution ID: {tool_execution_id}"
-                else:
-                    # No confirmation needed, execute the tool
+                if not requires_confirmation:
                     logger.info(f"Executing tool without confirmation: {tool_name}")
-                    
-                    tool_result = await execute_tool(tool_name, tool_input, available_tools)
-                    
-                    # Update tool usage with result
-                    tool_usage["output"] = tool_result
-                    
-                    # If NEEDS_TOOL, self-loop to process tool result
-                    if next_agent == agent_id or next_agent == "self":
-                        # Create new agent guidance with tool result
-                        new_guidance += f"\nTool {tool_name} returned: {str(tool_result)}"
-            else:
-                # Cannot access confirmation settings, default to execute
-                logger.info(f"Could not access confirmation settings, executing tool: {tool_name}")
+                    calls_to_execute.append(call)
+                    continue
+                
+                # Confirmation is required, save pending tool execution
+                # Generate a unique ID for this tool execution
+                tool_execution_id = f"{next(_tool_execution_counter):x}-{secrets.token_hex(8)}"
+                
+                logger.info(f"Tool requires confirmation, ID: {tool_execution_id}")
+                
+                # Store pending tool execution
+                flow_instance["pending_tool_executions"][tool_execution_id] = {
+                    "tool_name": tool_name,
+                    "tool_input": tool_input,
+                    "state": state,
+                    "timestamp": datetime.now().isoformat()
+                }
+                
+                confirmation_requests.append(
+                    f"I'd like to use the tool '{tool_name}' with the following input:\n\n{_dumps(tool_input, indent=True)}"
+                )
                 
-                tool_result = await execute_tool(tool_name, tool_input, available_tools)
+                # Set tool_usage output to indicate awaiting confirmation
+                call["output"] = "Awaiting user confirmation"
                 
+                # Update agent guidance
+                guidance_parts.append(f"Tool {tool_name} requires confirmation. Execution ID: {tool_execution_id}")
+            
+            if confirmation_requests:
+                # Update response and next_agent to indicate waiting for confirmation
+                response = "\n\n".join(confirmation_requests) + "\n\nPlease confirm if I can proceed."
+                next_agent = AWAITING_TOOL_CONFIRMATION
+            
+            # Execute the remaining tools, concurrently when there are several, starting
+            # them before the response chunk so tool latency overlaps with streaming it out
+            tool_task = asyncio.create_task(execute_tools(calls_to_execute, available_tools))
+            try:
+                yield response_chunk
+                tool_results = await tool_task
+            finally:
+                # No-op once the tools have finished; stops them if the stream is abandoned
+                tool_task.cancel()
+            
+            for call, tool_result in zip(calls_to_execute, tool_results):
                 # Update tool usage with result
-                tool_usage["output"] = tool_result
+                call["output"] = tool_result
                 
                 # If NEEDS_TOOL, self-loop to process tool result
                 if next_agent == agent_id or next_agent == "self":
                     # Create new agent guidance with tool result
-                    new_guidance += f"\nTool {tool_name} returned: {str(tool_result)}"
+                    guidance_parts.append(f"Tool {call['tool_name']} returned: {_format_tool_result(tool_result)}")
+            
+            new_guidance = "\n".join(guidance_parts)
+        else:
+            yield response_chunk
         
-        # Create thinking based on guidance and any tool usage
-        thinking = (
-            f"Processed input: {input_message}\n"
-            f"With guidance: {agent_guidance}\n"
-            f"Tool usage: {json.dumps(tool_usage) if tool_usage else 'None'}\n"
-            f"Response: {response}"
-        )
+        # Create thinking based on guidance and any tool usage (debug only)
+        thinking = None
+        if _DEBUG:
+            thinking = (
+                f"Processed input: {input_message}\n"
+                f"With guidance: {agent_guidance}\n"
+                f"Tool usage: {_dumps(tool_usage) if tool_usage else 'None'}\n"
+                f"Response: {response}"
+            )
         
         # Create the step
         step = await create_inner_agent_step(
@@ -37,20 +37,15 @@ IMPORTANT: The agent_guidance field is your primary channel for providing contex
 Be detailed but concise. Include any concerns, warnings, or special instructions.
 """
 
-# Inner agent prompt template
-# Fields: {system_prompt}, {input_message}, {agent_guidance}, {agent_id}, {available_tools}
-INNER_AGENT_PROMPT = """You are an inner agent ({agent_id}) in a multi-agent system.
+# Inner agent system prompt template
+# Static for the lifetime of an agent, so it is sent first where providers can cache it
+# Fields: {system_prompt}, {agent_id}, {available_tools}
+INNER_AGENT_SYSTEM_PROMPT = """You are an inner agent ({agent_id}) in a multi-agent system.
 You process inputs after they've been approved by a superego agent.
 
 SYSTEM INSTRUCTIONS:
 {system_prompt}
 
-USER INPUT:
-{input_message}
-
-SUPEREGO GUIDANCE (PRIVATE):
-{agent_guidance}
-
 AVAILABLE TOOLS:
 {available_tools}
 
@@ -78,6 +73,15 @@ Use it to provide insights, warnings, or relevant information that might not be
 to share directly with the user but would help other agents in the system.
 """
 
+# Inner agent per-turn input template
+# Fields: {input_message}, {agent_guidance}
+INNER_AGENT_INPUT_PROMPT = """USER INPUT:
+{input_message}
+
+SUPEREGO GUIDANCE (PRIVATE):
+{agent_guidance}
+"""
+
 # Template for simplified responses during streaming
 # Fields: {agent_id}, {partial_response}
 STREAMING_RESPONSE_TEMPLATE = """Agent {agent_id} is processing:
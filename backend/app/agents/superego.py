@@ -28,6 +28,15 @@ class SuperegoOutput(BaseModel):
     response: str = Field(description="Brief user-facing explanation of the decision")
 
 
+# Parser, format instructions and prompt template built once at import;
+# they depend only on constants
+_PARSER = PydanticOutputParser(pydantic_object=SuperegoOutput)
+_FORMAT_INSTRUCTIONS = _PARSER.get_format_instructions()
+_PROMPT = ChatPromptTemplate.from_template(
+    SUPEREGO_PROMPT + "\n\nOutput Format Instructions:\n{format_instructions}"
+)
+
+
 async def superego_evaluate(
     llm: BaseChatModel,
     input_message: str, 
@@ -46,29 +55,19 @@ async def superego_evaluate(
     import logging
     logger = logging.getLogger("uvicorn")
     
-    # Create output parser
-    parser = PydanticOutputParser(pydantic_object=SuperegoOutput)
-    
-    # Get format instructions
-    format_instructions = parser.get_format_instructions()
-    
-    # Create prompt without concatenating format_instructions directly
-    template = SUPEREGO_PROMPT + "\n\nOutput Format Instructions:\n{format_instructions}"
-    prompt = ChatPromptTemplate.from_template(template)
-    
     # Format prompt with all parameters
-    messages = prompt.format_messages(
+    messages = _PROMPT.format_messages(
         constitution=constitution,
         input_message=input_message,
         agent_id="superego",
-        format_instructions=format_instructions
+        format_instructions=_FORMAT_INSTRUCTIONS
     )
     
     logger.info("Prompt formatted successfully")
     
     # Call LLM
     response = await llm.ainvoke(messages)
-    result = parser.parse(response.content)
+    result = _PARSER.parse(response.content)
     
     # Validate decision
     valid_decisions = [BLOCK, ACCEPT, CAUTION, NEEDS_CLARIFICATION]
@@ -224,29 +224,13 @@ async def _execute_flow(
     try:
         # Build flow executor
         from ..flow import builder
-        from langchain_openai import ChatOpenAI
         from dotenv import load_dotenv
         
         # Load from .env file
         load_dotenv(dotenv_path=os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), ".env"))
         
-        # Get OpenRouter API key and model from .env
-        api_key = os.environ.get("OPENROUTER_API_KEY")
-        base_model = os.environ.get("BASE_MODEL", "anthropic/claude-3.5-sonnet")
-        
-        if not api_key:
-            raise ValueError("OPENROUTER_API_KEY not found in environment")
-            
-        # Configure for OpenRouter
-        llm = ChatOpenAI(
-            temperature=0,
-            model=base_model,
-            openai_api_key=api_key,
-            openai_api_base="https://openrouter.ai/api/v1"
-        )
-        
-        # Build flow
-        flow = await builder.build_flow(flow_def, llm)
+        # Build flow with the shared LLM
+        flow = await builder.build_flow(flow_def, flow_engine.get_llm())
         
         # Execute flow and create stream response
         return await stream_response(execute_flow(flow, input, flow_def))
@@ -424,7 +408,7 @@ async def update_confirmation_settings(
     # Update settings
     flow_instance["tool_confirmation_settings"] = {
         "confirm_all": settings.confirm_all,
-        "exempted_tools": settings.exempted_tools
+        "exempted_tools": frozenset(settings.exempted_tools)
     }
     
     return {
@@ -510,12 +494,8 @@ async def create_flow_instance(
         flow_def = flow_engine.flow_definitions[flow_id]
         logger.debug(f"Found flow definition: {flow_def.get('name', 'Unnamed Flow')}")
         
-        # Create LLM
-        logger.debug("Creating ChatOpenAI instance")
-        from langchain_openai import ChatOpenAI
-        from dotenv import load_dotenv
-        
         # Load from .env file
+        from dotenv import load_dotenv
         env_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), ".env")
         logger.debug(f"Loading .env from {env_path}")
         load_dotenv(dotenv_path=env_path)
@@ -532,15 +512,8 @@ async def create_flow_instance(
                 detail="OpenRouter API key not configured"
             )
         
-        logger.debug("Creating ChatOpenAI instance")
-        # Configure for OpenRouter
-        llm = ChatOpenAI(
-            temperature=0,
-            model=base_model,
-            openai_api_key=api_key,
-            openai_api_base="https://openrouter.ai/api/v1"
-        )
-        logger.debug("ChatOpenAI instance created successfully")
+        # Get the shared LLM
+        llm = flow_engine.get_llm()
         
         # Create flow graph
         logger.debug("Building flow graph")
@@ -563,7 +536,7 @@ async def create_flow_instance(
             "graph": flow_graph,
             "definition": flow_def,
             "history": [],
-            "tool_confirmation_settings": {"confirm_all": True, "exempted_tools": []},
+            "tool_confirmation_settings": {"confirm_all": True, "exempted_tools": frozenset()},
             "pending_tool_executions": {},
             "created_at": datetime.now().isoformat()
         }
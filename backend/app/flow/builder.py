@@ -75,7 +75,8 @@ async def build_flow(flow_def: Dict[str, Any], llm) -> StateGraph:
             max_iterations=config.get("max_iterations", 3),
             **({"constitution": config.get("constitution")} if node_type == "superego" else {}),
             **({"system_prompt": config.get("system_prompt")} if node_type == "inner_agent" else {}),
-            **({"available_tools": _get_tools(config.get("tools", []))} if node_type == "inner_agent" else {})
+            **({"available_tools": _get_tools(config.get("tools", []))} if node_type == "inner_agent" else {}),
+            **({"cache_ttl": config.get("cache_ttl")} if node_type == "inner_agent" else {})
         )
         logger.info(f"Adding node '{node_name}' to graph with function type: {type(node_fn).__name__}")
         
@@ -17,6 +17,13 @@ from app.flow.loader import load_flow, embed_constitutions, get_constitutions_ma
 from app.models import FlowStep, StreamChunk
 
 
+def _json_default(value: Any) -> Any:
+    """Serialize sets (e.g. exempted_tools) as sorted lists when saving instances."""
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
 class FlowEngine:
     """Minimalist flow orchestration engine. Provides a unified interface for 
     creating, executing, and managing flows without unnecessary abstractions.
@@ -27,12 +34,41 @@ class FlowEngine:
         self.flow_definitions = {}
         self.active_flows = {}
         self.constitutions = {}
+        self.llm = None
         
         # Path for storing flow instances
         self.instances_dir = pathlib.Path("app/data/flow_instances")
         # Ensure directory exists
         self.instances_dir.mkdir(parents=True, exist_ok=True)
     
+    def get_llm(self) -> Any:
+        """Get the shared OpenRouter LLM, creating it on first use.
+        
+        Reusing one client lets every flow share its HTTP connection pool
+        instead of paying connection and TLS setup for each new instance.
+        
+        Raises:
+            ValueError: If OPENROUTER_API_KEY is not set
+        """
+        if self.llm is None:
+            # Get OpenRouter API key and model from .env
+            api_key = os.environ.get("OPENROUTER_API_KEY")
+            base_model = os.environ.get("BASE_MODEL", "anthropic/claude-3.5-sonnet")
+            
+            if not api_key:
+                raise ValueError("OPENROUTER_API_KEY not found in environment")
+            
+            # Configure LLM for OpenRouter
+            from langchain_openai import ChatOpenAI
+            self.llm = ChatOpenAI(
+                temperature=0,
+                model=base_model,
+                openai_api_key=api_key,
+                openai_api_base="https://openrouter.ai/api/v1"
+            )
+        
+        return self.llm
+    
     async def load_constitutions(self, directory: str) -> None:
         """Load constitutions from directory."""
         self.constitutions = await get_constitutions_map(directory)
@@ -79,6 +115,11 @@ class FlowEngine:
                 # This prevents excessive rebuilding at startup
                 instance_data["graph"] = None  # Will be built when needed
                 
+                # Exempted tools are checked on every tool call, so keep them as a set
+                settings = instance_data.get("tool_confirmation_settings")
+                if settings:
+                    settings["exempted_tools"] = frozenset(settings.get("exempted_tools", ()))
+                
                 # Store in memory
                 self.active_flows[instance_id] = instance_data
             except Exception as e:
@@ -111,7 +152,7 @@ class FlowEngine:
         # Save to file
         file_path = self.instances_dir / f"{instance_id}.json"
         with open(file_path, "w") as f:
-            json.dump(serializable_data, f, indent=2)
+            json.dump(serializable_data, f, indent=2, default=_json_default)
     
     async def create_flow(self, flow_id: str, llm: Any) -> str:
         if flow_id not in self.flow_definitions:
@@ -127,7 +168,7 @@ class FlowEngine:
             "graph": flow_graph,
             "definition": flow_def,
             "history": [],
-            "tool_confirmation_settings": {"confirm_all": True, "exempted_tools": []},
+            "tool_confirmation_settings": {"confirm_all": True, "exempted_tools": frozenset()},
             "pending_tool_executions": {},
             "created_at": datetime.now().isoformat()
         }
@@ -148,25 +189,9 @@ class FlowEngine:
             logger = logging.getLogger("uvicorn")
             logger.info(f"Building flow graph on demand for instance {instance_id}")
             
-            # Get OpenRouter API key and model from .env
-            api_key = os.environ.get("OPENROUTER_API_KEY")
-            base_model = os.environ.get("BASE_MODEL", "anthropic/claude-3.5-sonnet")
-            
-            if not api_key:
-                raise ValueError("OPENROUTER_API_KEY not found in environment")
-            
-            # Configure LLM for OpenRouter
-            from langchain_openai import ChatOpenAI
-            llm = ChatOpenAI(
-                temperature=0,
-                model=base_model,
-                openai_api_key=api_key,
-                openai_api_base="https://openrouter.ai/api/v1"
-            )
-            
-            # Build flow graph
+            # Build flow graph with the shared LLM
             flow_def = flow_data["definition"]
-            flow_graph = await build_flow(flow_def, llm)
+            flow_graph = await build_flow(flow_def, self.get_llm())
             
             # Update instance data with the new graph
             flow_data["graph"] = flow_graph
@@ -251,6 +276,10 @@ class FlowEngine:
         }
 
 
+# Maximum prompts kept by the optional process-wide LLM cache
+LLM_CACHE_MAXSIZE = 1024
+
+
 # Singleton instance for global access
 # This avoids unnecessary class instantiation while maintaining a clear API
 flow_engine = FlowEngine()
@@ -267,6 +296,14 @@ async def initialize_engine(constitutions_dir: str, flow_defs_dir: str) -> FlowE
     print(f"Loading environment from: {env_path}")
     load_dotenv(dotenv_path=env_path)
     
+    # Opt-in process-wide LangChain LLM cache for identical prompts. LangChain only
+    # consults it for non-streaming calls (superego evaluation); streamed inner agent
+    # calls use the per-node cache_ttl cache instead.
+    if os.environ.get("SUPEREGO_LLM_CACHE") == "1":
+        from langchain_core.caches import InMemoryCache
+        from langchain_core.globals import set_llm_cache
+        set_llm_cache(InMemoryCache(maxsize=LLM_CACHE_MAXSIZE))
+    
     # Now initialize the engine components
     await flow_engine.load_constitutions(constitutions_dir)
     await flow_engine.load_flow_definitions(flow_defs_dir)
@@ -4,7 +4,7 @@ Shared models for Superego Agent System
 Contains Pydantic models used across multiple modules to avoid circular imports.
 """
 
-from typing import Dict, Optional, Any
+from typing import Dict, List, Optional, Any, Union
 from pydantic import BaseModel, Field
 
 
@@ -25,7 +25,7 @@ class FlowStep(BaseModel):
     input: Optional[str] = Field(None, description="Input provided to this step")
     system_prompt: Optional[str] = Field(None, description="System prompt used for this step")
     thinking: Optional[str] = Field(None, description="Agent's thinking process (not shown to user)")
-    tool_usage: Optional[Dict[str, Any]] = Field(None, description="Record of any tool usage in this step")
+    tool_usage: Optional[Union[Dict[str, Any], List[Dict[str, Any]]]] = Field(None, description="Record of any tool usage in this step (a list when several tools ran)")
     agent_guidance: Optional[str] = Field(None, description="Guidance provided to the next agent")
     response: str = Field(description="Response content from this step")
     next_agent: Optional[str] = Field(None, description="ID of the next agent to call")
@@ -25,6 +25,12 @@ interface FlowNode {
 }
 
 // Flow Execution Types
+interface ToolUsage {
+  tool_name: string;
+  input: any;
+  output: any;
+}
+
 interface FlowStep {
   step_id: string;
   agent_id: string;
@@ -38,11 +44,7 @@ interface FlowStep {
   
   // Inner agent-specific fields
   system_prompt?: string;
-  tool_usage?: {
-    tool_name: string;
-    input: any;
-    output: any;
-  };
+  tool_usage?: ToolUsage | ToolUsage[];
   
   // Common fields
   response: string;